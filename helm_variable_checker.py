@@ -11,11 +11,29 @@ Usage:
 
 import os
 import re
+import mmap
+import stat
+import pickle
+import hashlib
+import tempfile
 import yaml
 import argparse
 import logging
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Set, Dict, Any, List, Tuple
+from typing import Dict, Any, Iterator, List, Optional, Tuple
+
+try:
+    # libyaml's C loader parses several times faster than the pure-Python one
+    from yaml import CSafeLoader as _YamlLoader
+except ImportError:
+    from yaml import SafeLoader as _YamlLoader
+
+try:
+    # google-re2 matches in linear time and is faster on large files; optional
+    import re2
+except ImportError:
+    re2 = None
 
 # Configure logging
 logging.basicConfig(
@@ -24,24 +42,76 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Regex pattern to match Helm template variables
+# Matches patterns like {{ .Values.PG.R1.DBName }}, {{ .Values.AppName | quote }}
+# Compiled as bytes so files can be scanned through mmap without decoding them.
+# Whitespace is spelled out as [ \t\n\r\f\v] because re and re2 disagree on \s
+# (re2 excludes \v). Only ASCII whitespace separates: Unicode spaces such as a
+# non-breaking space (U+00A0) end up in the variable name, which is then
+# reported as missing
+_VARIABLE_PATTERN_SOURCE = (
+    rb'\{\{[ \t\n\r\f\v]*\.Values\.([^} \t\n\r\f\v|]+)'
+    rb'(?:[ \t\n\r\f\v]*\|[ \t\n\r\f\v]*[^}]+)?[ \t\n\r\f\v]*\}\}'
+)
+if re2 is not None:
+    # re2 reads bytes as UTF-8 by default and silently skips references containing
+    # invalid sequences; Latin-1 treats every byte as one character, like re does
+    _re2_options = re2.Options()
+    _re2_options.encoding = re2.Options.Encoding.LATIN1
+    _VARIABLE_PATTERN = re2.compile(_VARIABLE_PATTERN_SOURCE, _re2_options)
+else:
+    _VARIABLE_PATTERN = re.compile(_VARIABLE_PATTERN_SOURCE)
+
+# Upper bound on files read concurrently; this also caps open file descriptors
+_MAX_SCAN_WORKERS = min(32, (os.cpu_count() or 1) * 4)
+
+# Parsed values files are cached here between runs, one entry per absolute path,
+# valid while the SHA-256 of the file contents is unchanged. The directory is
+# per user and only trusted while it is private to that user, since entries are
+# pickles. Bump the version whenever the entry layout changes
+_VALUES_CACHE_DIR = os.path.join(
+    tempfile.gettempdir(),
+    f"helm_values_cache-{os.getuid()}" if hasattr(os, 'getuid') else 'helm_values_cache'
+)
+_VALUES_CACHE_VERSION = 2
+# Larger entries are not written, so the cache cannot fill the temp directory
+_VALUES_CACHE_MAX_BYTES = 8 * 1024 * 1024
+
 
 class HelmVariableChecker:
-    def __init__(self, helm_charts_paths: List[str], values_file_path: str):
+    __slots__ = ('helm_charts_paths', 'values_file_path', 'values_data',
+                 'helm_file_extensions', 'use_cache', '_exists_cache')
+    
+    def __init__(self, helm_charts_paths: List[str], values_file_path: str, use_cache: bool = True):
         # Keep paths as strings to preserve relative path format
         self.helm_charts_paths = helm_charts_paths
         self.values_file_path = values_file_path
+        self.use_cache = use_cache
         self.values_data = {}
+        self._exists_cache: Dict[str, bool] = {}
         self.helm_file_extensions = {'.yaml', '.yml', '.tpl'}
-        
-        # Regex pattern to match Helm template variables
-        # Matches patterns like {{ .Values.PG.R1.DBName }}, {{ .Values.AppName | quote }}
-        self.variable_pattern = re.compile(r'\{\{\s*\.Values\.([^}\s|]+)(?:\s*\|\s*[^}]+)?\s*\}\}')
     
     def load_values_file(self) -> bool:
-        """Load and parse the values YAML file."""
+        """
+        Load and parse the values YAML file.
+        
+        Unless use_cache is False, the parsed data is cached on disk, so repeated
+        runs against an unchanged values file skip YAML parsing.
+        """
         try:
-            with open(self.values_file_path, 'r', encoding='utf-8') as file:
-                self.values_data = yaml.safe_load(file) or {}
+            with open(self.values_file_path, 'rb') as file:
+                content = file.read()
+            digest = hashlib.sha256(content).hexdigest()
+            
+            cache_enabled = self.use_cache and self._values_cache_dir_is_private()
+            values_data = self._read_values_cache(digest) if cache_enabled else None
+            if values_data is None:
+                values_data = yaml.load(content.decode('utf-8'), Loader=_YamlLoader) or {}
+                if cache_enabled:
+                    self._write_values_cache(digest, values_data)
+            self.values_data = values_data
+            # Cached lookups are only valid for the values that produced them
+            self._exists_cache.clear()
             logger.info(f"Successfully loaded values file: {self.values_file_path}")
             return True
         except FileNotFoundError:
@@ -54,6 +124,72 @@ class HelmVariableChecker:
             logger.error(f"Error reading values file {self.values_file_path}: {e}")
             return False
     
+    @staticmethod
+    def _values_cache_dir_is_private() -> bool:
+        """Create the cache directory if needed and check that only this user can write to it."""
+        try:
+            try:
+                os.mkdir(_VALUES_CACHE_DIR, 0o700)
+            except FileExistsError:
+                pass
+            info = os.lstat(_VALUES_CACHE_DIR)
+        except OSError as e:
+            logger.debug(f"Values cache unavailable at {_VALUES_CACHE_DIR}: {e}")
+            return False
+        
+        if not stat.S_ISDIR(info.st_mode):
+            private = False
+        elif hasattr(os, 'getuid'):
+            private = info.st_uid == os.getuid() and not info.st_mode & 0o077
+        else:
+            # The temp directory is already per user on Windows
+            private = True
+        
+        if not private:
+            logger.warning(f"Not using values cache: {_VALUES_CACHE_DIR} is not a private directory")
+        return private
+    
+    def _values_cache_file(self) -> str:
+        """Return the cache file path for the values file, one entry per file."""
+        key = f"{_VALUES_CACHE_VERSION}\0{os.path.abspath(self.values_file_path)}"
+        return os.path.join(_VALUES_CACHE_DIR, f"{hashlib.sha256(key.encode('utf-8')).hexdigest()}.pickle")
+    
+    def _read_values_cache(self, digest: str) -> Optional[Any]:
+        """Return the cached values data, or None if there is no up-to-date entry."""
+        try:
+            with open(self._values_cache_file(), 'rb') as file:
+                entry = pickle.load(file)
+        except Exception:
+            # Missing, truncated or otherwise unreadable entries are just a miss
+            return None
+        
+        if not isinstance(entry, dict) or entry.get('digest') != digest:
+            return None
+        return entry.get('values')
+    
+    def _write_values_cache(self, digest: str, values_data: Any):
+        """Store the parsed values data; failures only cost the next run time."""
+        cache_file = self._values_cache_file()
+        try:
+            # Pickle keeps YAML aliases shared, so entries stay close to the file size
+            payload = pickle.dumps({'digest': digest, 'values': values_data},
+                                   protocol=pickle.HIGHEST_PROTOCOL)
+            if len(payload) > _VALUES_CACHE_MAX_BYTES:
+                logger.debug(f"Not caching values file {self.values_file_path}: entry is {len(payload)} bytes")
+                return
+            
+            # Write to a temporary file first so readers never see a partial entry
+            fd, temp_path = tempfile.mkstemp(dir=_VALUES_CACHE_DIR, suffix='.tmp')
+            try:
+                with os.fdopen(fd, 'wb') as file:
+                    file.write(payload)
+                os.replace(temp_path, cache_file)
+            except BaseException:
+                os.unlink(temp_path)
+                raise
+        except (OSError, pickle.PicklingError, RecursionError) as e:
+            logger.debug(f"Could not write values cache {cache_file}: {e}")
+    
     def check_variable_exists(self, variable_path: str) -> bool:
         """
         Check if a variable path exists in the values data.
@@ -64,6 +200,17 @@ class HelmVariableChecker:
         Returns:
             True if the variable exists, False otherwise
         """
+        # The same variables are referenced from many files, so remember results
+        cached = self._exists_cache.get(variable_path)
+        if cached is not None:
+            return cached
+        
+        exists = self._lookup_variable(variable_path)
+        self._exists_cache[variable_path] = exists
+        return exists
+    
+    def _lookup_variable(self, variable_path: str) -> bool:
+        """Walk the values data along a dot-separated variable path."""
         parts = variable_path.split('.')
         current = self.values_data
         
@@ -77,7 +224,8 @@ class HelmVariableChecker:
         except (TypeError, KeyError):
             return False
     
-    def extract_variables_from_file(self, file_path: Path) -> Set[str]:
+    @staticmethod
+    def extract_variables_from_file(file_path: str) -> List[str]:
         """
         Extract all Helm variable references from a file.
         
@@ -85,44 +233,74 @@ class HelmVariableChecker:
             file_path: Path to the Helm chart file
         
         Returns:
-            Set of variable paths found in the file
+            List of variable paths found in the file, in order of appearance and
+            including repeats; callers deduplicate as needed
         """
-        variables = set()
+        variables = []
         
         try:
-            with open(file_path, 'r', encoding='utf-8') as file:
-                content = file.read()
-                
-            # Find all variable references
-            matches = self.variable_pattern.findall(content)
-            variables.update(matches)
+            with open(file_path, 'rb') as file:
+                # Empty files cannot be mapped, and have nothing to find anyway
+                if os.fstat(file.fileno()).st_size:
+                    with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as content:
+                        # A plain substring search rules out files without any
+                        # references much faster than running the regex over them
+                        if content.find(b'.Values.') != -1:
+                            # Find all variable references
+                            # Invalid UTF-8 in a name must not drop the file's other matches
+                            variables = [match.group(1).decode('utf-8', 'replace')
+                                         for match in _VARIABLE_PATTERN.finditer(content)]
             
         except Exception as e:
             logger.warning(f"Error reading file {file_path}: {e}")
         
         return variables
     
-    def get_helm_chart_files(self) -> List[Path]:
+    def get_helm_chart_files(self) -> List[str]:
         """
         Get all Helm chart files in the specified directories.
         
         Returns:
-            List of Path objects for Helm chart files
+            List of file paths (as strings) for Helm chart files
         """
         helm_files = []
         
         for helm_charts_path_str in self.helm_charts_paths:
-            helm_charts_path = Path(helm_charts_path_str)
             try:
-                for root, dirs, files in os.walk(helm_charts_path):
-                    for file in files:
-                        file_path = Path(root) / file
-                        if file_path.suffix.lower() in self.helm_file_extensions:
-                            helm_files.append(file_path)
+                helm_files.extend(self._walk_helm_files(helm_charts_path_str))
             except Exception as e:
-                logger.error(f"Error traversing helm charts directory {helm_charts_path}: {e}")
+                logger.error(f"Error traversing helm charts directory {helm_charts_path_str}: {e}")
         
         return helm_files
+    
+    def _walk_helm_files(self, root: str) -> Iterator[str]:
+        """
+        Yield Helm chart file paths below root in the same top-down order as os.walk.
+        
+        Directory entries are inspected by name only, so no Path object is built
+        for files that are not Helm chart files. Symlinked directories are not
+        followed, matching os.walk's default.
+        """
+        stack = [root]
+        while stack:
+            directory = stack.pop()
+            subdirs = []
+            try:
+                with os.scandir(directory) as entries:
+                    for entry in entries:
+                        if entry.is_dir():
+                            if not entry.is_symlink():
+                                subdirs.append(entry.path)
+                            continue
+                        # Same rule as Path.suffix: a leading dot alone is not an extension
+                        stem, _, extension = entry.name.rpartition('.')
+                        if stem and f".{extension.lower()}" in self.helm_file_extensions:
+                            yield entry.path
+            except OSError as e:
+                logger.warning(f"Error reading directory {directory}: {e}")
+                continue
+            # Reversed so the first subdirectory is visited next
+            stack.extend(reversed(subdirs))
 
     @staticmethod
     def parse_bom_file(bom_file_path: str) -> List[str]:
@@ -139,7 +317,7 @@ class HelmVariableChecker:
         
         try:
             with open(bom_file_path, 'r', encoding='utf-8') as file:
-                bom_data = yaml.safe_load(file)
+                bom_data = yaml.load(file, Loader=_YamlLoader)
             
             # Navigate to spec.workloadList
             if 'spec' in bom_data and 'workloadList' in bom_data['spec']:
@@ -164,62 +342,86 @@ class HelmVariableChecker:
             
         return chart_paths
     
-    def generate_report(self) -> List[Tuple[str, str, bool]]:
+    def generate_report(self) -> Dict[str, List[Tuple[str, bool]]]:
         """
         Generate a report of all variable references and their existence status.
         
         Returns:
-            List of tuples containing (filename, variable_reference, exists)
+            Dictionary mapping each filename to a sorted list of
+            (variable_reference, exists) tuples
         """
         if not self.load_values_file():
-            return []
+            return {}
         
         helm_files = self.get_helm_chart_files()
         logger.info(f"Found {len(helm_files)} Helm chart files to process")
         
-        report = []
+        report: Dict[str, List[Tuple[str, bool]]] = {}
         total_variables = 0
         
-        for file_path in helm_files:
-            # Find which base path this file belongs to and create relative path
-            relative_path = None
-            for base_path_str in self.helm_charts_paths:
-                base_path = Path(base_path_str)
-                try:
-                    relative_path = file_path.relative_to(base_path)
-                    # Combine base path string with relative path for display
-                    display_path = f"{base_path_str}/{relative_path}".replace('\\', '/')
-                    break
-                except ValueError:
-                    continue
-            
-            # If we couldn't find a relative path, use the full path
-            if relative_path is None:
-                display_path = str(file_path).replace('\\', '/')
-            else:
-                display_path = str(relative_path).replace('\\', '/')
-                
-            variables = self.extract_variables_from_file(file_path)
+        # Files are independent and reading them is I/O bound, so scan them
+        # concurrently; map() yields results in the original file order
+        scanned = []
+        all_variables = set()
+        with ThreadPoolExecutor(max_workers=_MAX_SCAN_WORKERS) as executor:
+            results = executor.map(self.extract_variables_from_file, helm_files)
+            for file_path, matches in zip(helm_files, results):
+                variables = set(matches)
+                all_variables |= variables
+                scanned.append((file_path, variables))
+        
+        # Many files reference the same variables; check each distinct one once
+        exists_map = {variable: self.check_variable_exists(variable) for variable in all_variables}
+        
+        # Resolve against the working directory fetched once; os.path.abspath
+        # would look it up again for every file
+        cwd = os.getcwd()
+        
+        # Absolute chart roots with a trailing separator, longest first, so each
+        # file is shown relative to the most specific root that contains it
+        base_prefixes = sorted(
+            (os.path.join(os.path.normpath(os.path.join(cwd, base_path_str)), '')
+             for base_path_str in self.helm_charts_paths),
+            key=len, reverse=True
+        )
+        
+        for file_path, variables in scanned:
+            absolute_path = os.path.normpath(os.path.join(cwd, file_path))
+            # If the file is under none of the roots, use the full path
+            display_path = next(
+                (absolute_path[len(prefix):] for prefix in base_prefixes if absolute_path.startswith(prefix)),
+                file_path
+            ).replace('\\', '/')
             
             if variables:
                 logger.info(f"Processing file: {display_path} ({len(variables)} variables found)")
                 
-                for variable in sorted(variables):
-                    exists = self.check_variable_exists(variable)
-                    report.append((display_path, variable, exists))
-                    total_variables += 1
+                # Grouped by file here so print_report needs no second pass
+                report.setdefault(display_path, []).extend(
+                    (variable, exists_map[variable]) for variable in variables
+                )
+                total_variables += len(variables)
+        
+        # Files with the same relative path in different charts share a group,
+        # so groups are sorted once all files have been added
+        for file_report in report.values():
+            file_report.sort()
         
         logger.info(f"Total variables processed: {total_variables}")
         return report
     
     def print_report(self):
         """Print the complete report with formatted output."""
-        logger.info("=" * 80)
-        logger.info("HELM VARIABLE REFERENCE CHECKER REPORT")
-        logger.info("=" * 80)
-        logger.info(f"Helm Charts Paths: {', '.join(self.helm_charts_paths)}")
-        logger.info(f"Values File: {self.values_file_path}")
-        logger.info("=" * 80)
+        # Each block is emitted as a single multi-line record to keep the number
+        # of logging calls independent of the number of variables
+        logger.info("\n".join([
+            "=" * 80,
+            "HELM VARIABLE REFERENCE CHECKER REPORT",
+            "=" * 80,
+            f"Helm Charts Paths: {', '.join(self.helm_charts_paths)}",
+            f"Values File: {self.values_file_path}",
+            "=" * 80,
+        ]))
         
         report = self.generate_report()
         
@@ -227,29 +429,25 @@ class HelmVariableChecker:
             logger.warning("No variable references found or unable to process files")
             return
         
-        # Group by file for better readability
-        files_dict = {}
-        for filename, variable, exists in report:
-            if filename not in files_dict:
-                files_dict[filename] = []
-            files_dict[filename].append((variable, exists))
-        
         missing_count = 0
-        total_count = len(report)
+        total_count = sum(len(file_variables) for file_variables in report.values())
         
-        for filename in sorted(files_dict.keys()):
-            logger.info(f"\nFile: {filename}")
-            logger.info("-" * 40)
+        for filename in sorted(report.keys()):
+            lines = [f"\nFile: {filename}", "-" * 40]
             
-            for variable, exists in sorted(files_dict[filename]):
+            for variable, exists in report[filename]:
                 status = "✓" if exists else "✗"
                 if not exists:
                     missing_count += 1
                 
-                logger.info(f"  {status} .Values.{variable}")
+                lines.append(f"  {status} .Values.{variable}")
+            
+            logger.info("\n".join(lines))
         
-        logger.info("=" * 80)
-        logger.info(f"SUMMARY: {total_count - missing_count}/{total_count} variables found in values file")
+        logger.info("\n".join([
+            "=" * 80,
+            f"SUMMARY: {total_count - missing_count}/{total_count} variables found in values file",
+        ]))
         if missing_count > 0:
             logger.warning(f"{missing_count} variables are missing from {self.values_file_path}")
         else:
@@ -279,6 +477,12 @@ def main():
         help='Path to the values YAML file (e.g., values-dev.yaml)'
     )
     
+    parser.add_argument(
+        '--no-cache',
+        action='store_true',
+        help='Do not read or write the on-disk cache of parsed values files'
+    )
+    
     args = parser.parse_args()
     
     # Determine chart paths based on input method
@@ -331,7 +535,7 @@ def main():
         return 1
     
     # Create checker and run report (keeping original relative path)
-    checker = HelmVariableChecker(chart_paths, args.values_file)
+    checker = HelmVariableChecker(chart_paths, args.values_file, use_cache=not args.no_cache)
     checker.print_report()
     
     return 0